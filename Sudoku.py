@@ -108,6 +108,23 @@ class SudokuGame:
                 self.board[row][col] = 0
         return False
 
+    def count_solutions(self, limit=2):
+        find = self.find_empty()
+        if not find:
+            return 1
+        else:
+            row, col = find
+
+        count = 0
+        for i in range(1, 10):
+            if self.is_valid(row, col, i):
+                self.board[row][col] = i
+                count += self.count_solutions(limit - count)
+                self.board[row][col] = 0
+                if count >= limit:
+                    break
+        return count
+
     def is_board_valid(self):
         for row in range(9):
             for col in range(9):
@@ -0,0 +1,216 @@
+"""
+Bit-parallel Sudoku search and DIMACS CNF export.
+
+The board is held as nine 81-bit Python ints, one per digit, where bit
+``row * 9 + col`` is set while that digit is still a candidate for the cell.
+Each propagation round finds naked singles for all 81 cells with a handful
+of big-int operations, then looks for hidden singles unit by unit.
+"""
+
+ALL_CELLS = (1 << 81) - 1
+
+
+def _unit_masks():
+    units = []
+    for r in range(9):
+        units.append(sum(1 << (r * 9 + c) for c in range(9)))
+    for c in range(9):
+        units.append(sum(1 << (r * 9 + c) for r in range(9)))
+    for br in range(0, 9, 3):
+        for bc in range(0, 9, 3):
+            units.append(sum(1 << ((br + i) * 9 + bc + j)
+                             for i in range(3) for j in range(3)))
+    return units
+
+
+UNITS = _unit_masks()
+
+# PEERS[cell] covers the cell itself plus every cell sharing a unit with it.
+PEERS = [0] * 81
+for _unit in UNITS:
+    for _cell in range(81):
+        if _unit >> _cell & 1:
+            PEERS[_cell] |= _unit
+
+
+def _bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BitboardState:
+    def __init__(self):
+        self.cand = [ALL_CELLS] * 10   # index 0 unused so digits index directly
+        self.placed = [0] * 10
+        self.open = ALL_CELLS
+
+    def copy(self):
+        other = BitboardState.__new__(BitboardState)
+        other.cand = self.cand[:]
+        other.placed = self.placed[:]
+        other.open = self.open
+        return other
+
+    def place(self, cell, digit):
+        bit = 1 << cell
+        if not self.cand[digit] & bit:
+            return False
+        self.cand[digit] &= ~PEERS[cell]
+        for d in range(1, 10):
+            self.cand[d] &= ~bit
+        self.placed[digit] |= bit
+        self.open &= ~bit
+        return True
+
+    def candidate_planes(self, depth=2):
+        """Return masks of cells with at least 1, 2, ..., ``depth`` candidates."""
+        planes = [0] * depth
+        for d in range(1, 10):
+            c = self.cand[d]
+            for k in range(depth - 1, 0, -1):
+                planes[k] |= planes[k - 1] & c
+            planes[0] |= c
+        return planes
+
+    def fewest_candidates_cell(self):
+        """Return an open cell with the fewest candidates, picked bitwise."""
+        planes = self.candidate_planes(depth=9) + [0]
+        for k in range(9):
+            exact = planes[k] & ~planes[k + 1] & self.open
+            if exact:
+                return (exact & -exact).bit_length() - 1
+        return None
+
+    def propagate(self):
+        while self.open:
+            ones, twos = self.candidate_planes()
+            if self.open & ~ones:
+                return False
+            progress = False
+
+            singles = self.open & ~twos
+            for cell in _bits(singles):
+                for d in range(1, 10):
+                    if self.cand[d] >> cell & 1:
+                        break
+                if not self.place(cell, d):
+                    return False
+                progress = True
+
+            for d in range(1, 10):
+                for unit in UNITS:
+                    if self.placed[d] & unit:
+                        continue
+                    hits = self.cand[d] & unit
+                    if not hits:
+                        return False
+                    if hits & (hits - 1) == 0:
+                        if not self.place(hits.bit_length() - 1, d):
+                            return False
+                        progress = True
+
+            if not progress:
+                return True
+        return True
+
+    def to_board(self):
+        board = [[0] * 9 for _ in range(9)]
+        for d in range(1, 10):
+            for cell in _bits(self.placed[d]):
+                board[cell // 9][cell % 9] = d
+        return board
+
+
+def from_board(board):
+    """Build a state from a 9x9 list board, or return None if the givens clash."""
+    state = BitboardState()
+    for r in range(9):
+        for c in range(9):
+            num = board[r][c]
+            if num and not state.place(r * 9 + c, num):
+                return None
+    return state
+
+
+def _search(state, limit, found):
+    if not state.propagate():
+        return
+    if not state.open:
+        found.append(state.to_board())
+        return
+
+    cell = state.fewest_candidates_cell()
+    for d in range(1, 10):
+        if state.cand[d] >> cell & 1:
+            child = state.copy()
+            child.place(cell, d)
+            _search(child, limit, found)
+            if len(found) >= limit:
+                return
+
+
+def find_solutions(board, limit=2):
+    """Return up to ``limit`` solutions of a 9x9 list board."""
+    state = from_board(board)
+    found = []
+    if state is not None:
+        _search(state, limit, found)
+    return found
+
+
+def solve_bitboard(board):
+    """Return a solved copy of the board, or None if it has no solution."""
+    solutions = find_solutions(board, limit=1)
+    return solutions[0] if solutions else None
+
+
+def count_solutions(board, limit=2):
+    return len(find_solutions(board, limit))
+
+
+def dimacs_var(row, col, num):
+    """1-based DIMACS variable meaning "cell (row, col) holds num"."""
+    return row * 81 + col * 9 + num
+
+
+def to_dimacs(board):
+    """Encode the board as a DIMACS CNF string over 729 variables."""
+    clauses = []
+    cells = [(r, c) for r in range(9) for c in range(9)]
+    for r, c in cells:
+        clauses.append([dimacs_var(r, c, n) for n in range(1, 10)])
+        for a in range(1, 10):
+            for b in range(a + 1, 10):
+                clauses.append([-dimacs_var(r, c, a), -dimacs_var(r, c, b)])
+
+    groups = [[(r, c) for c in range(9)] for r in range(9)]
+    groups += [[(r, c) for r in range(9)] for c in range(9)]
+    groups += [[(br + i, bc + j) for i in range(3) for j in range(3)]
+               for br in range(0, 9, 3) for bc in range(0, 9, 3)]
+    for group in groups:
+        for n in range(1, 10):
+            clauses.append([dimacs_var(r, c, n) for r, c in group])
+            for i in range(9):
+                for j in range(i + 1, 9):
+                    (r1, c1), (r2, c2) = group[i], group[j]
+                    clauses.append([-dimacs_var(r1, c1, n), -dimacs_var(r2, c2, n)])
+
+    for r, c in cells:
+        if board[r][c]:
+            clauses.append([dimacs_var(r, c, board[r][c])])
+
+    lines = [f"p cnf 729 {len(clauses)}"]
+    lines += [" ".join(map(str, clause)) + " 0" for clause in clauses]
+    return "\n".join(lines) + "\n"
+
+
+def board_from_model(literals):
+    """Decode a SAT model (iterable of signed ints) back into a 9x9 board."""
+    board = [[0] * 9 for _ in range(9)]
+    for lit in literals:
+        if 0 < lit <= 729:
+            idx = lit - 1
+            board[idx // 81][idx // 9 % 9] = idx % 9 + 1
+    return board
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Differential test harness for the solver engines.
+
+Random boards are run through every engine and the answers are compared
+with the reference backtracking solver in ``SudokuGame``: whether the
+board is solvable, whether the solution is unique, and whether each
+returned solution is a valid completion of the givens. Per-engine timings
+are collected so performance work can be checked against the same runs.
+"""
+
+import copy
+import functools
+import random
+import time
+
+import bitboard
+from Sudoku import SudokuGame
+
+
+def random_transform(board, rng):
+    """
+    Return a random equivalent of ``board``: digits relabeled, bands,
+    stacks, rows within bands and columns within stacks shuffled, and
+    transposed half of the time.
+    """
+    def shuffled_groups():
+        groups = rng.sample(range(3), 3)
+        return [g * 3 + i for g in groups for i in rng.sample(range(3), 3)]
+
+    rows, cols = shuffled_groups(), shuffled_groups()
+    digits = [0] + rng.sample(range(1, 10), 9)
+    grid = [[digits[board[r][c]] for c in cols] for r in rows]
+    if rng.random() < 0.5:
+        grid = [list(col) for col in zip(*grid)]
+    return grid
+
+
+def random_solution(rng):
+    """Return a random solved grid built by shuffling a base pattern."""
+    base = [[(3 * (r % 3) + r // 3 + c) % 9 + 1 for c in range(9)] for r in range(9)]
+    return random_transform(base, rng)
+
+
+def random_puzzle(rng, clues=36):
+    """Return a valid board with ``clues`` givens taken from a random solution."""
+    grid = random_solution(rng)
+    for cell in rng.sample(range(81), 81 - clues):
+        grid[cell // 9][cell % 9] = 0
+    return grid
+
+
+def random_invalid_board(rng, clues=40):
+    """
+    Return a board that is usually unsolvable.
+
+    Either a given is copied into a peer cell so the givens clash, or a
+    given is swapped for another digit that does not clash directly. The
+    second kind can occasionally still be solvable; the harness relies on
+    the reference engine rather than on this label.
+    """
+    board = random_puzzle(rng, clues)
+    givens = [(r, c) for r in range(9) for c in range(9) if board[r][c]]
+    row, col = rng.choice(givens)
+    num = board[row][col]
+
+    if rng.random() < 0.5:
+        peers = [(row, c) for c in range(9)] + [(r, col) for r in range(9)]
+        peers = [(r, c) for r, c in peers if (r, c) != (row, col)]
+        r, c = rng.choice(peers)
+        board[r][c] = num
+        return board
+
+    game = SudokuGame(board)
+    board[row][col] = 0
+    others = [n for n in range(1, 10) if n != num and game.is_valid(row, col, n)]
+    board[row][col] = rng.choice(others) if others else num
+    return board
+
+
+def is_valid_solution(board, solution):
+    """Check that ``solution`` is a complete grid that keeps every given."""
+    full = set(range(1, 10))
+    for i in range(9):
+        if set(solution[i]) != full or {solution[r][i] for r in range(9)} != full:
+            return False
+        br, bc = 3 * (i // 3), 3 * (i % 3)
+        if {solution[br + r][bc + c] for r in range(3) for c in range(3)} != full:
+            return False
+    return all(board[r][c] in (0, solution[r][c]) for r in range(9) for c in range(9))
+
+
+@functools.lru_cache(maxsize=None)
+def _rule_clauses():
+    empty = [[0] * 9 for _ in range(9)]
+    lines = bitboard.to_dimacs(empty).splitlines()[1:]
+    return tuple(tuple(int(tok) for tok in line.split()[:-1]) for line in lines)
+
+
+def satisfies_dimacs(board, solution):
+    """Check a solution against the DIMACS CNF export of the board."""
+    model = {bitboard.dimacs_var(r, c, solution[r][c]) for r in range(9) for c in range(9)}
+    givens = tuple((bitboard.dimacs_var(r, c, board[r][c]),)
+                   for r in range(9) for c in range(9) if board[r][c])
+    for clause in _rule_clauses() + givens:
+        if not any((lit > 0) == (abs(lit) in model) for lit in clause):
+            return False
+    return True
+
+
+def run_backtracking(board):
+    game = SudokuGame(copy.deepcopy(board))
+    for r in range(9):
+        for c in range(9):
+            if board[r][c] and not game.is_valid(r, c, board[r][c]):
+                return 0, None
+    count = game.count_solutions(limit=2)
+    if not count:
+        return 0, None
+    game.solve()
+    return count, game.board
+
+
+def run_bitboard(board):
+    solutions = bitboard.find_solutions(board, limit=2)
+    return len(solutions), solutions[0] if solutions else None
+
+
+# Every engine takes a 9x9 list board and returns (solution count capped
+# at 2, one solution or None). The first entry is the reference.
+ENGINES = {
+    "backtracking": run_backtracking,
+    "bitboard": run_bitboard,
+}
+
+
+def run_differential(boards, engines=ENGINES):
+    """
+    Run every engine on every board and compare them with the reference.
+
+    Returns ``(mismatches, timings)`` where ``mismatches`` lists
+    ``(board, engine, reason)`` tuples and ``timings`` maps each engine
+    name to its per-board elapsed seconds.
+    """
+    reference = next(iter(engines))
+    mismatches = []
+    timings = {name: [] for name in engines}
+
+    for board in boards:
+        results = {}
+        for name, engine in engines.items():
+            start = time.perf_counter()
+            results[name] = engine(copy.deepcopy(board))
+            timings[name].append(time.perf_counter() - start)
+
+        ref_count, _ = results[reference]
+        for name, (count, solution) in results.items():
+            if (count > 0) != (ref_count > 0):
+                mismatches.append((board, name, "solvability"))
+            elif count != ref_count:
+                mismatches.append((board, name, "uniqueness"))
+            elif solution is not None and not is_valid_solution(board, solution):
+                mismatches.append((board, name, "invalid solution"))
+            elif solution is not None and not satisfies_dimacs(board, solution):
+                mismatches.append((board, name, "violates CNF"))
+
+    return mismatches, timings
+
+
+def generate_boards(seed, count, invalid_ratio=0.3):
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        if rng.random() < invalid_ratio:
+            boards.append(random_invalid_board(rng, rng.randint(36, 45)))
+        else:
+            boards.append(random_puzzle(rng, rng.randint(30, 45)))
+    return boards
+
+
+def main():
+    boards = generate_boards(seed=2024, count=100)
+    mismatches, timings = run_differential(boards)
+
+    print(f"Checked {len(boards)} boards across {len(timings)} engines")
+    for name, times in timings.items():
+        print(f"  {name:<14} total {sum(times):8.3f}s  "
+              f"mean {sum(times) / len(times) * 1000:8.2f}ms  max {max(times) * 1000:8.2f}ms")
+    for board, name, reason in mismatches:
+        print(f"MISMATCH [{name}] {reason}: {board}")
+    return not mismatches
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
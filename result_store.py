@@ -0,0 +1,256 @@
+"""
+Fixed-record binary store for bulk solve results.
+
+Records are appended to a single data file and read back through mmap.
+A companion ``.idx`` file holds an open-addressing hash table keyed by a
+64-bit puzzle hash, so lookups never have to scan the data file.
+
+Only committed records are visible. The data file header carries the
+committed record count, which is written after the records themselves
+have been flushed, so an interrupted batch reopens at its last commit.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import time
+from collections import namedtuple
+
+import bitboard
+
+DATA_MAGIC = b"SUDRES01"
+INDEX_MAGIC = b"SUDIDX01"
+HEADER = struct.Struct("<8sIIQ")      # magic, record size, reserved, committed count
+RECORD = struct.Struct("<81s81sBd")   # puzzle, solution, solution count, elapsed seconds
+INDEX_HEADER = struct.Struct("<8sQQ")  # magic, capacity, indexed count
+SLOT = struct.Struct("<QQ")           # puzzle hash, record number + 1
+MIN_CAPACITY = 1024
+
+ResultRecord = namedtuple("ResultRecord", ["puzzle", "solution", "solutions", "elapsed"])
+
+
+def encode_board(board):
+    return bytes(cell for row in board for cell in row)
+
+
+def decode_board(data):
+    return [list(data[r * 9:r * 9 + 9]) for r in range(9)]
+
+
+def puzzle_hash(puzzle_bytes):
+    key = int.from_bytes(hashlib.blake2b(puzzle_bytes, digest_size=8).digest(), "little")
+    return key or 1  # 0 marks an empty index slot
+
+
+class ResultStore:
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + ".idx"
+        self._data_map = None
+        self._index_map = None
+        self._pending = 0
+
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(HEADER.pack(DATA_MAGIC, RECORD.size, 0, 0))
+        self._file = open(path, "r+b")
+
+        magic, record_size, _, committed = HEADER.unpack(self._file.read(HEADER.size))
+        if magic != DATA_MAGIC or record_size != RECORD.size:
+            self._file.close()
+            raise ValueError(f"{path} is not a result store.")
+        self._committed = committed
+
+        # Drop anything written after the last commit.
+        self._file.truncate(self._offset(committed))
+        self._remap_data()
+        self._open_index()
+
+    def _offset(self, number):
+        return HEADER.size + number * RECORD.size
+
+    def __len__(self):
+        return self._committed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._file is None:
+            return
+        if self._data_map is not None:
+            self._data_map.close()
+        if self._index_map is not None:
+            self._index_map.close()
+        self._index_file.close()
+        self._file.close()
+        self._file = None
+
+    # -- writing -----------------------------------------------------------
+
+    def append(self, puzzle, solution, solutions, elapsed):
+        """Queue one record; it becomes visible after the next commit()."""
+        solution_bytes = encode_board(solution) if solution else bytes(81)
+        record = RECORD.pack(encode_board(puzzle), solution_bytes, min(solutions, 255), elapsed)
+        self._file.seek(self._offset(self._committed + self._pending))
+        self._file.write(record)
+        self._pending += 1
+
+    def commit(self):
+        if not self._pending:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        self._committed += self._pending
+        self._pending = 0
+        self._remap_data()
+        self._catch_up_index()
+
+        self._file.seek(0)
+        self._file.write(HEADER.pack(DATA_MAGIC, RECORD.size, 0, self._committed))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    # -- reading -----------------------------------------------------------
+
+    def _remap_data(self):
+        if self._data_map is not None:
+            self._data_map.close()
+        self._data_map = mmap.mmap(self._file.fileno(), self._offset(self._committed),
+                                   access=mmap.ACCESS_READ)
+
+    def _raw_puzzle(self, number):
+        start = self._offset(number)
+        return self._data_map[start:start + 81]
+
+    def __getitem__(self, number):
+        if number < 0:
+            number += self._committed
+        if not 0 <= number < self._committed:
+            raise IndexError("record number out of range")
+        puzzle, solution, solutions, elapsed = RECORD.unpack_from(self._data_map, self._offset(number))
+        return ResultRecord(decode_board(puzzle),
+                            decode_board(solution) if solutions else None,
+                            solutions, elapsed)
+
+    def __iter__(self):
+        for number in range(self._committed):
+            yield self[number]
+
+    def find(self, puzzle):
+        """Return the record number stored for a puzzle, or None."""
+        puzzle_bytes = encode_board(puzzle)
+        key = puzzle_hash(puzzle_bytes)
+        mask = self._capacity - 1
+        slot = key & mask
+        while True:
+            stored_key, value = SLOT.unpack_from(self._index_map, INDEX_HEADER.size + slot * SLOT.size)
+            if value == 0:
+                return None
+            if stored_key == key and self._raw_puzzle(value - 1) == puzzle_bytes:
+                return value - 1
+            slot = (slot + 1) & mask
+
+    def lookup(self, puzzle):
+        number = self.find(puzzle)
+        return None if number is None else self[number]
+
+    # -- index -------------------------------------------------------------
+
+    def _open_index(self):
+        capacity = indexed = None
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as f:
+                header = f.read(INDEX_HEADER.size)
+            if len(header) == INDEX_HEADER.size:
+                magic, capacity, indexed = INDEX_HEADER.unpack(header)
+                expected = INDEX_HEADER.size + capacity * SLOT.size
+                if magic != INDEX_MAGIC or os.path.getsize(self.index_path) != expected:
+                    capacity = None
+
+        if capacity is None or indexed > self._committed or self._committed * 2 > capacity:
+            self._rebuild_index(self._capacity_for(self._committed))
+            return
+
+        self._index_file = open(self.index_path, "r+b")
+        self._map_index(capacity)
+        self._catch_up_index()
+
+    def _capacity_for(self, count):
+        capacity = MIN_CAPACITY
+        while count * 2 >= capacity:
+            capacity *= 2
+        return capacity
+
+    def _map_index(self, capacity):
+        self._capacity = capacity
+        self._index_map = mmap.mmap(self._index_file.fileno(), 0)
+        _, _, self._indexed = INDEX_HEADER.unpack_from(self._index_map, 0)
+
+    def _rebuild_index(self, capacity):
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_file.close()
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, capacity, 0))
+            f.truncate(INDEX_HEADER.size + capacity * SLOT.size)
+        os.replace(tmp_path, self.index_path)
+
+        self._index_file = open(self.index_path, "r+b")
+        self._map_index(capacity)
+        self._catch_up_index()
+
+    def _catch_up_index(self):
+        while self._indexed < self._committed:
+            self._index_insert(self._indexed)
+        self._write_index_count()
+
+    def _index_insert(self, number):
+        if (self._indexed + 1) * 2 > self._capacity:
+            # The rebuild indexes every committed record, including this one.
+            self._rebuild_index(max(self._capacity * 2, self._capacity_for(self._committed)))
+            return
+        puzzle_bytes = self._raw_puzzle(number)
+        key = puzzle_hash(puzzle_bytes)
+        mask = self._capacity - 1
+        slot = key & mask
+        while True:
+            offset = INDEX_HEADER.size + slot * SLOT.size
+            stored_key, value = SLOT.unpack_from(self._index_map, offset)
+            if value == 0:
+                SLOT.pack_into(self._index_map, offset, key, number + 1)
+                break
+            if stored_key == key and self._raw_puzzle(value - 1) == puzzle_bytes:
+                break  # keep the first record for a repeated puzzle
+            slot = (slot + 1) & mask
+        self._indexed += 1
+
+    def _write_index_count(self):
+        INDEX_HEADER.pack_into(self._index_map, 0, INDEX_MAGIC, self._capacity, self._indexed)
+        self._index_map.flush()
+
+
+def solve_batch(puzzle_list, store, commit_every=1000):
+    """
+    Solve puzzles into the store, skipping those already committed.
+
+    Records line up with ``puzzle_list`` by position, so rerunning an
+    interrupted batch with the same list resumes after the last commit.
+    """
+    for number, puzzle in enumerate(puzzle_list):
+        if number < len(store):
+            continue
+        start = time.perf_counter()
+        solutions = bitboard.find_solutions(puzzle, limit=2)
+        elapsed = time.perf_counter() - start
+        store.append(puzzle, solutions[0] if solutions else None, len(solutions), elapsed)
+        if (number + 1) % commit_every == 0:
+            store.commit()
+    store.commit()
+    return len(store)
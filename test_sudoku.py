@@ -6,9 +6,15 @@ This demonstrates what testing infrastructure could look like.
 import unittest
 import json
 import os
+import random
 import tempfile
+import time
 from Sudoku import SudokuGame, choose_puzzle
 import puzzles
+import bitboard
+from result_store import ResultStore, solve_batch
+import differential
+import dedup
 
 
 class TestSudokuGame(unittest.TestCase):
@@ -198,6 +204,206 @@ class TestSudokuValidation(unittest.TestCase):
                         self.assertIn(cell, range(0, 10), f"Invalid cell value in {difficulty} puzzle")
 
 
+class TestBitboardSolver(unittest.TestCase):
+
+    def test_matches_backtracking_solution(self):
+        """Test that the bitboard solver agrees with SudokuGame.solve."""
+        puzzle = puzzles.HARD_PUZZLES[0]
+        solution = bitboard.solve_bitboard(puzzle)
+        game = SudokuGame([row[:] for row in puzzle])
+        self.assertTrue(game.solve())
+        self.assertEqual(solution, game.board)
+
+    def test_solves_hard_puzzle(self):
+        """Test that the hard puzzle has exactly one solution."""
+        solutions = bitboard.find_solutions(puzzles.HARD_PUZZLES[0])
+        self.assertEqual(len(solutions), 1)
+        for row in solutions[0]:
+            self.assertEqual(sorted(row), list(range(1, 10)))
+
+    def test_conflicting_givens(self):
+        """Test that clashing givens are reported as unsolvable."""
+        board = [row[:] for row in puzzles.HARD_PUZZLES[0]]
+        board[0][0] = 2  # 2 already sits in row 1
+        self.assertIsNone(bitboard.from_board(board))
+        self.assertIsNone(bitboard.solve_bitboard(board))
+        self.assertEqual(bitboard.count_solutions(board), 0)
+
+    def test_branches_on_fewest_candidates(self):
+        """Test that the branching cell has the fewest candidates."""
+        state = bitboard.from_board(puzzles.HARD_PUZZLES[0])
+        self.assertTrue(state.propagate())
+        counts = {cell: sum(state.cand[d] >> cell & 1 for d in range(1, 10))
+                  for cell in range(81) if state.open >> cell & 1}
+        self.assertEqual(counts[state.fewest_candidates_cell()], min(counts.values()))
+
+    def test_dimacs_export(self):
+        """Test that the CNF is satisfied by the solution and decodes back."""
+        puzzle = puzzles.HARD_PUZZLES[0]
+        solution = bitboard.solve_bitboard(puzzle)
+        model = {bitboard.dimacs_var(r, c, solution[r][c]) for r in range(9) for c in range(9)}
+
+        lines = bitboard.to_dimacs(puzzle).splitlines()
+        _, _, num_vars, num_clauses = lines[0].split()
+        self.assertEqual(int(num_vars), 729)
+        self.assertEqual(int(num_clauses), len(lines) - 1)
+        for line in lines[1:]:
+            literals = [int(tok) for tok in line.split()[:-1]]
+            self.assertTrue(any((lit > 0) == (abs(lit) in model) for lit in literals))
+
+        self.assertEqual(bitboard.board_from_model(model), solution)
+
+
+class TestResultStore(unittest.TestCase):
+
+    def setUp(self):
+        """Create a scratch directory and a small batch of puzzles."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "results.bin")
+        puzzle = puzzles.HARD_PUZZLES[0]
+        solution = bitboard.solve_bitboard(puzzle)
+        self.batch = []
+        for r, c in [(r, c) for r in range(9) for c in range(9) if not puzzle[r][c]][:12]:
+            board = [row[:] for row in puzzle]
+            board[r][c] = solution[r][c]
+            self.batch.append(board)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_append_and_lookup(self):
+        """Test that committed records can be read back and looked up."""
+        with ResultStore(self.path) as store:
+            self.assertEqual(solve_batch(self.batch, store, commit_every=5), len(self.batch))
+            record = store.lookup(self.batch[3])
+            self.assertEqual(record.puzzle, self.batch[3])
+            self.assertEqual(record.solution, bitboard.solve_bitboard(self.batch[3]))
+            self.assertIsNone(store.lookup(puzzles.MEDIUM_PUZZLES[0]))
+
+    def test_resume_after_interruption(self):
+        """Test that uncommitted records are dropped and the batch resumes."""
+        store = ResultStore(self.path)
+        solve_batch(self.batch[:4], store)
+        store.append(self.batch[4], None, 0, 0.0)
+        store.close()
+
+        with ResultStore(self.path) as store:
+            self.assertEqual(len(store), 4)
+            solve_batch(self.batch, store)
+            self.assertEqual([record.puzzle for record in store], self.batch)
+
+    def test_index_rebuilt_when_missing(self):
+        """Test that lookups still work after the index file is deleted."""
+        with ResultStore(self.path) as store:
+            solve_batch(self.batch, store)
+        os.unlink(self.path + ".idx")
+        with ResultStore(self.path) as store:
+            self.assertEqual(store.find(self.batch[-1]), len(self.batch) - 1)
+
+
+class TestDifferential(unittest.TestCase):
+
+    def test_count_solutions(self):
+        """Test that the backtracking solver counts solutions up to a limit."""
+        rng = random.Random(1)
+        board = differential.random_solution(rng)
+        self.assertEqual(SudokuGame([row[:] for row in board]).count_solutions(), 1)
+
+        # Clear cells until the puzzle stops being unique.
+        for cell in rng.sample(range(81), 81):
+            board[cell // 9][cell % 9] = 0
+            if bitboard.count_solutions(board) == 2:
+                break
+        self.assertEqual(SudokuGame([row[:] for row in board]).count_solutions(), 2)
+        self.assertEqual(SudokuGame([row[:] for row in board]).count_solutions(limit=5),
+                         bitboard.count_solutions(board, limit=5))
+
+    def test_random_boards_are_well_formed(self):
+        """Test that generated puzzles keep their givens consistent."""
+        rng = random.Random(7)
+        for _ in range(20):
+            solution = differential.random_solution(rng)
+            self.assertTrue(differential.is_valid_solution(solution, solution))
+            puzzle = differential.random_puzzle(rng, clues=30)
+            self.assertEqual(sum(1 for row in puzzle for cell in row if cell), 30)
+
+    def test_engines_agree(self):
+        """Test that every engine agrees with SudokuGame on random boards."""
+        boards = differential.generate_boards(seed=11, count=40)
+        mismatches, timings = differential.run_differential(boards)
+        self.assertEqual(mismatches, [])
+        for name in differential.ENGINES:
+            self.assertEqual(len(timings[name]), len(boards))
+
+    def test_detects_disagreement(self):
+        """Test that a faulty engine is reported."""
+        engines = dict(differential.ENGINES, broken=lambda board: (1, board))
+        boards = differential.generate_boards(seed=3, count=5)
+        mismatches, _ = differential.run_differential(boards, engines)
+        self.assertTrue(any(name == "broken" for _, name, _ in mismatches))
+
+
+class TestDeduplication(unittest.TestCase):
+
+    def test_canonical_form_is_invariant(self):
+        """Test that equivalent puzzles share one canonical form."""
+        rng = random.Random(5)
+        for puzzle in puzzles.HARD_PUZZLES + [differential.random_puzzle(rng, 26)]:
+            form = dedup.canonical_form(puzzle)
+            for _ in range(3):
+                variant = differential.random_transform(puzzle, rng)
+                self.assertEqual(dedup.canonical_form(variant), form)
+
+    def test_different_puzzles_differ(self):
+        """Test that inequivalent puzzles get different fingerprints."""
+        self.assertNotEqual(dedup.fingerprint(puzzles.MEDIUM_PUZZLES[0]),
+                            dedup.fingerprint(puzzles.HARD_PUZZLES[0]))
+
+    def test_sparse_boards(self):
+        """Test that sparse boards are rejected or canonicalised quickly."""
+        near_empty = [[0] * 9 for _ in range(9)]
+        near_empty[4][4] = 5
+        with self.assertRaises(ValueError):
+            dedup.canonical_form(near_empty)
+        self.assertEqual(list(dedup.dedupe([near_empty], capacity=4)), [])
+
+        rng = random.Random(17)
+        start = time.perf_counter()
+        for _ in range(10):
+            dedup.canonical_form(differential.random_puzzle(rng, dedup.MIN_CLUES))
+        self.assertLess(time.perf_counter() - start, 5.0)
+
+    def test_dedupe_stream(self):
+        """Test that only the first puzzle of each class is kept."""
+        rng = random.Random(9)
+        originals = [differential.random_puzzle(rng, 30) for _ in range(3)]
+        stream = []
+        for board in originals:
+            stream += [board] + [differential.random_transform(board, rng) for _ in range(2)]
+        self.assertEqual(list(dedup.dedupe(stream, capacity=16)), originals)
+
+    def test_fingerprint_set(self):
+        """Test membership and the fixed capacity of the fingerprint set."""
+        seen = dedup.FingerprintSet(4)
+        self.assertTrue(seen.add(0))
+        self.assertFalse(seen.add(0))
+        for key in (7, 2 ** 64 - 1, 12345):
+            self.assertTrue(seen.add(key))
+        self.assertIn(12345, seen)
+        self.assertNotIn(99, seen)
+        self.assertEqual(len(seen), 4)
+        with self.assertRaises(OverflowError):
+            for key in range(100, 200):
+                seen.add(key)
+
+    def test_parse_puzzle_line(self):
+        """Test parsing of 81-character puzzle lines."""
+        line = "".join(str(cell) if cell else "." for row in puzzles.HARD_PUZZLES[0] for cell in row)
+        self.assertEqual(dedup.parse_puzzle_line(line + "\n"), puzzles.HARD_PUZZLES[0])
+        self.assertIsNone(dedup.parse_puzzle_line("123"))
+        self.assertIsNone(dedup.parse_puzzle_line("x" * 81))
+
+
 if __name__ == '__main__':
     # Run the tests
     unittest.main(verbosity=2)
\ No newline at end of file